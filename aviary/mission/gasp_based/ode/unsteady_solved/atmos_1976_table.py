@@ -0,0 +1,147 @@
+import numpy as np
+import openmdao.api as om
+from dymos.models.atmosphere.atmos_1976 import USatm1976Data
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _poly(c, dx):
+    return c[0] + dx * (c[1] + dx * (c[2] + dx * c[3]))
+
+
+def _dpoly(c, dx):
+    return c[1] + dx * (2.0 * c[2] + 3.0 * c[3] * dx)
+
+
+def _atmos_eval(h, alt, coefs, K, out_temp, out_pres, out_rho, out_viscosity,
+                out_drhos_dh, out_sos, out_dsos_dh):
+    """
+    Evaluate the 1976 standard atmosphere at each altitude in h. coefs holds the akima
+    coefficients of temp, pres, rho, viscosity, drho_dh and dT_dh, in that order.
+    """
+    for i in range(h.shape[0]):
+        idx = np.searchsorted(alt, h[i].real)
+        dx = h[i] - alt[max(idx - 1, 0)]
+
+        temp = _poly(coefs[0, idx], dx)
+        out_temp[i] = temp
+        out_pres[i] = _poly(coefs[1, idx], dx)
+        out_rho[i] = _poly(coefs[2, idx], dx)
+        out_drhos_dh[i] = _dpoly(coefs[2, idx], dx)
+        out_viscosity[i] = _poly(coefs[3, idx], dx)
+
+        sos = np.sqrt(K * temp)
+        out_sos[i] = sos
+        out_dsos_dh[i] = 0.5 * K / sos * _poly(coefs[5, idx], dx)
+
+
+def _atmos_partials(h, alt, coefs, K, d_temp, d_pres, d_rho, d_viscosity,
+                    d_drhos_dh, d_sos, d_dsos_dh):
+    """
+    Evaluate the derivatives of the 1976 standard atmosphere outputs with respect to
+    altitude at each altitude in h.
+    """
+    for i in range(h.shape[0]):
+        idx = np.searchsorted(alt, h[i].real)
+        dx = h[i] - alt[max(idx - 1, 0)]
+
+        temp = _poly(coefs[0, idx], dx)
+        dT_dh = _dpoly(coefs[0, idx], dx)
+
+        d_temp[i] = dT_dh
+        d_pres[i] = _dpoly(coefs[1, idx], dx)
+        d_rho[i] = _dpoly(coefs[2, idx], dx)
+        d_viscosity[i] = _dpoly(coefs[3, idx], dx)
+        d_drhos_dh[i] = _dpoly(coefs[4, idx], dx)
+
+        d_sos[i] = 0.5 * np.sqrt(K / temp) * dT_dh
+        d_dsos_dh[i] = 0.5 * np.sqrt(K / temp) * \
+            (_dpoly(coefs[5, idx], dx) - 0.5 * dT_dh**2 / temp)
+
+
+if numba is not None:
+    # the numpy error model returns inf/nan on division by zero like the dymos
+    # implementation, instead of raising ZeroDivisionError. The fast-math flags leave
+    # out nnan and ninf, so that those values are not optimized away.
+    _jit = numba.njit(cache=True, fastmath={'contract', 'arcp', 'reassoc'},
+                      error_model="numpy")
+    _poly = _jit(_poly)
+    _dpoly = _jit(_dpoly)
+    atmos_eval = _jit(_atmos_eval)
+    atmos_partials = _jit(_atmos_partials)
+else:
+    atmos_eval = _atmos_eval
+    atmos_partials = _atmos_partials
+
+
+class AtmosTable1976(om.ExplicitComponent):
+    """
+    Drop-in replacement for the dymos USatm1976Comp (geopotential altitude, with
+    output_dsos_dh=True) that evaluates the same akima tables in a single compiled loop
+    over the nodes. Requires numba.
+    """
+
+    # altitude breakpoints (ft) and akima coefficients of the dymos 1976 tables
+    H_BANDS = USatm1976Data.alt
+    COEFS = np.ascontiguousarray(np.stack((USatm1976Data.akima_T,
+                                           USatm1976Data.akima_P,
+                                           USatm1976Data.akima_rho,
+                                           USatm1976Data.akima_viscosity,
+                                           USatm1976Data.akima_drho,
+                                           USatm1976Data.akima_dT)))
+
+    # ratio of specific heats times the gas constant, (ft lbf)/(slug R)
+    K = 1.4 * 1716.49
+
+    def initialize(self):
+        self.options.declare('num_nodes', types=int,
+                             desc='Number of nodes to be evaluated in the RHS')
+
+    def setup(self):
+        if numba is None:
+            raise ImportError("numba package not found. You can install it by running "
+                              "'pip install numba'.")
+
+        nn = self.options['num_nodes']
+
+        self.add_input('h', val=np.ones(nn), units='ft')
+
+        self.add_output('temp', val=np.ones(nn), units='degR')
+        self.add_output('pres', val=np.ones(nn), units='psi')
+        self.add_output('rho', val=np.ones(nn), units='slug/ft**3')
+        self.add_output('viscosity', val=np.ones(nn), units='lbf*s/ft**2')
+        self.add_output('drhos_dh', val=np.ones(nn), units='slug/ft**4')
+        self.add_output('sos', val=np.ones(nn), units='ft/s')
+        self.add_output('dsos_dh', val=np.ones(nn), units='1/s')
+
+    def setup_partials(self):
+        nn = self.options['num_nodes']
+        ar = np.arange(nn, dtype=int)
+
+        self.declare_partials(['temp', 'pres', 'rho', 'viscosity', 'drhos_dh', 'sos',
+                               'dsos_dh'], 'h', rows=ar, cols=ar)
+
+    def compute(self, inputs, outputs):
+        atmos_eval(inputs['h'], self.H_BANDS, self.COEFS, self.K,
+                   outputs['temp'], outputs['pres'], outputs['rho'],
+                   outputs['viscosity'], outputs['drhos_dh'], outputs['sos'],
+                   outputs['dsos_dh'])
+
+    def compute_partials(self, inputs, partials):
+        h = inputs['h']
+        d_temp, d_pres, d_rho, d_viscosity, d_drhos_dh, d_sos, d_dsos_dh = \
+            np.empty((7, h.size), dtype=h.dtype)
+
+        atmos_partials(h, self.H_BANDS, self.COEFS, self.K,
+                       d_temp, d_pres, d_rho, d_viscosity, d_drhos_dh, d_sos, d_dsos_dh)
+
+        partials['temp', 'h'] = d_temp
+        partials['pres', 'h'] = d_pres
+        partials['rho', 'h'] = d_rho
+        partials['viscosity', 'h'] = d_viscosity
+        partials['drhos_dh', 'h'] = d_drhos_dh
+        partials['sos', 'h'] = d_sos
+        partials['dsos_dh', 'h'] = d_dsos_dh
@@ -0,0 +1,332 @@
+import numpy as np
+import openmdao.api as om
+
+from aviary import constants
+from aviary.variable_info.enums import SpeedType
+from aviary.variable_info.variables import Dynamic
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# kernel codes of the input speed types
+_SPEED_MODES = {SpeedType.TAS: 0, SpeedType.EAS: 1, SpeedType.MACH: 2}
+
+_FPA = Dynamic.Mission.FLIGHT_PATH_ANGLE
+_Q = Dynamic.Mission.DYNAMIC_PRESSURE
+_MACH = Dynamic.Mission.MACH
+_SOS = Dynamic.Mission.SPEED_OF_SOUND
+
+# (of, wrt) pairs of the partials, in the order written by the partials kernel. The
+# derivative of dTAS_dt_approx wrt dh_dr always comes last since it is dropped in
+# ground roll.
+_PARTIALS = {
+    SpeedType.TAS: (
+        (_FPA, "dh_dr"), ("dgam_dr", "dh_dr"), ("dgam_dr", "d2h_dr2"),
+        (_Q, "rho"), (_Q, "TAS"),
+        (_MACH, "TAS"), (_MACH, _SOS),
+        ("EAS", "TAS"), ("EAS", "rho"),
+        ("dTAS_dt_approx", "dTAS_dr"), ("dTAS_dt_approx", "TAS"),
+        ("dTAS_dt_approx", "dh_dr"),
+    ),
+    SpeedType.EAS: (
+        (_FPA, "dh_dr"), ("dgam_dr", "dh_dr"), ("dgam_dr", "d2h_dr2"),
+        (_Q, "EAS"),
+        ("TAS", "EAS"), ("TAS", "rho"),
+        (_MACH, "EAS"), (_MACH, "rho"), (_MACH, _SOS),
+        ("dTAS_dt_approx", "dEAS_dr"), ("dTAS_dt_approx", "EAS"),
+        ("dTAS_dt_approx", "rho"), ("dTAS_dt_approx", "drho_dh"),
+        ("dTAS_dt_approx", "dh_dr"),
+    ),
+    SpeedType.MACH: (
+        (_FPA, "dh_dr"), ("dgam_dr", "dh_dr"), ("dgam_dr", "d2h_dr2"),
+        (_Q, _SOS), (_Q, _MACH), (_Q, "rho"),
+        ("TAS", _SOS), ("TAS", _MACH),
+        ("EAS", _SOS), ("EAS", _MACH), ("EAS", "rho"),
+        ("dTAS_dt_approx", "dmach_dr"), ("dTAS_dt_approx", "dsos_dh"),
+        ("dTAS_dt_approx", _MACH), ("dTAS_dt_approx", _SOS),
+        ("dTAS_dt_approx", "dh_dr"),
+    ),
+}
+
+
+def _fused_kinematics(mode, ground_roll, dh_dr, d2h_dr2, rho, sos, v, dv_dr, dx_dh,
+                      rho_sl, out_gamma, out_dgam_dr, out_q, out_dTAS_dt_approx,
+                      out_1, out_2):
+    """
+    Evaluate GammaComp and UnsteadySolvedFlightConditions node by node.
+
+    v, dv_dr and dx_dh are the input speed, its rate per unit range and the altitude
+    rate of density (EAS) or speed of sound (MACH). out_1 and out_2 are the two speeds
+    that are not inputs, in the order EAS, mach (TAS), TAS, mach (EAS) or EAS, TAS
+    (MACH).
+    """
+    c_eas = rho_sl**1.5 / rho_sl**2.5
+
+    for i in range(dh_dr.shape[0]):
+        s = dh_dr[i]
+        one_s2 = 1.0 + s * s
+
+        out_gamma[i] = np.arctan(s)
+        out_dgam_dr[i] = d2h_dr2[i] / one_s2
+
+        if ground_roll:
+            cgam = 1.0
+            sgam = 0.0
+        else:
+            cgam = 1.0 / np.sqrt(one_s2)
+            sgam = s * cgam
+
+        sqrt_rho_rho_sl = np.sqrt(rho[i] / rho_sl)
+
+        if mode == 0:
+            tas = v[i]
+            out_1[i] = tas * sqrt_rho_rho_sl
+            out_2[i] = tas / sos[i]
+            out_dTAS_dt_approx[i] = dv_dr[i] * tas * cgam
+        elif mode == 1:
+            eas = v[i]
+            tas = eas / sqrt_rho_rho_sl
+            out_1[i] = tas
+            out_2[i] = tas / sos[i]
+            out_dTAS_dt_approx[i] = dv_dr[i] * tas * cgam * (rho_sl / rho[i])**1.5 \
+                - 0.5 * eas * dx_dh[i] * tas * sgam * c_eas
+        else:
+            mach = v[i]
+            tas = sos[i] * mach
+            out_1[i] = tas * sqrt_rho_rho_sl
+            out_2[i] = tas
+            out_dTAS_dt_approx[i] = dv_dr[i] * tas * cgam * sos[i] \
+                + dx_dh[i] * tas * sgam * tas / sos[i]
+
+        out_q[i] = 0.5 * rho[i] * tas**2
+
+
+def _fused_kinematics_partials(mode, ground_roll, dh_dr, d2h_dr2, rho, sos, v, dv_dr,
+                               dx_dh, rho_sl, J):
+    """
+    Evaluate the partials of the fused kinematics node by node. Row k of J holds the
+    partial given by entry k of _PARTIALS for the speed type of mode.
+    """
+    c_eas = rho_sl**1.5 / rho_sl**2.5
+
+    for i in range(dh_dr.shape[0]):
+        s = dh_dr[i]
+        one_s2 = 1.0 + s * s
+
+        J[0, i] = 1.0 / one_s2
+        J[1, i] = -2.0 * s * d2h_dr2[i] / one_s2**2
+        J[2, i] = 1.0 / one_s2
+
+        if ground_roll:
+            cgam = 1.0
+            sgam = 0.0
+            dcgam = 0.0
+            dsgam = 0.0
+        else:
+            cgam = 1.0 / np.sqrt(one_s2)
+            sgam = s * cgam
+            dcgam = -s * cgam / one_s2
+            dsgam = cgam / one_s2
+
+        r = np.sqrt(rho[i] / rho_sl)
+        dr_drho = 0.5 / r / rho_sl
+
+        if mode == 0:
+            tas = v[i]
+            J[3, i] = 0.5 * tas**2
+            J[4, i] = rho[i] * tas
+            J[5, i] = 1.0 / sos[i]
+            J[6, i] = -tas / sos[i]**2
+            J[7, i] = r
+            J[8, i] = tas * dr_drho
+            J[9, i] = tas * cgam
+            J[10, i] = dv_dr[i] * cgam
+            J[11, i] = dv_dr[i] * tas * dcgam
+        elif mode == 1:
+            eas = v[i]
+            tas = eas / r
+            dtas_deas = 1.0 / r
+            dtas_drho = -eas * dr_drho / r**2
+            k = (rho_sl / rho[i])**1.5
+            dk_drho = -1.5 * k / rho[i]
+            b = 0.5 * c_eas * dx_dh[i]
+
+            J[3, i] = eas * rho_sl
+            J[4, i] = dtas_deas
+            J[5, i] = dtas_drho
+            J[6, i] = dtas_deas / sos[i]
+            J[7, i] = dtas_drho / sos[i]
+            J[8, i] = -tas / sos[i]**2
+            J[9, i] = tas * cgam * k
+            J[10, i] = dv_dr[i] * cgam * k * dtas_deas \
+                - b * sgam * (tas + eas * dtas_deas)
+            J[11, i] = dv_dr[i] * cgam * (dtas_drho * k + tas * dk_drho) \
+                - b * eas * sgam * dtas_drho
+            J[12, i] = -0.5 * c_eas * eas * tas * sgam
+            J[13, i] = dv_dr[i] * tas * k * dcgam - b * eas * tas * dsgam
+        else:
+            mach = v[i]
+            a = sos[i]
+            tas = a * mach
+
+            J[3, i] = rho[i] * a * mach**2
+            J[4, i] = rho[i] * a**2 * mach
+            J[5, i] = 0.5 * a**2 * mach**2
+            J[6, i] = mach
+            J[7, i] = a
+            J[8, i] = mach * r
+            J[9, i] = a * r
+            J[10, i] = tas * dr_drho
+            J[11, i] = mach * a**2 * cgam
+            J[12, i] = mach**2 * a * sgam
+            J[13, i] = dv_dr[i] * a**2 * cgam + 2.0 * dx_dh[i] * mach * a * sgam
+            J[14, i] = 2.0 * dv_dr[i] * mach * a * cgam + dx_dh[i] * mach**2 * sgam
+            J[15, i] = dv_dr[i] * mach * a**2 * dcgam + dx_dh[i] * mach**2 * a * dsgam
+
+
+if numba is not None:
+    # the numpy error model returns inf/nan on division by zero like the separate
+    # components, instead of raising ZeroDivisionError. The fast-math flags leave out
+    # nnan and ninf, so that those values are not optimized away.
+    _jit = numba.njit(cache=True, fastmath={'contract', 'arcp', 'reassoc'},
+                      error_model="numpy")
+    fused_kinematics = _jit(_fused_kinematics)
+    fused_kinematics_partials = _jit(_fused_kinematics_partials)
+else:
+    fused_kinematics = _fused_kinematics
+    fused_kinematics_partials = _fused_kinematics_partials
+
+
+class FusedFlightKinematics(om.ExplicitComponent):
+    """
+    GammaComp and UnsteadySolvedFlightConditions evaluated together in a single
+    compiled loop over the nodes, so that the flight path angle and the intermediate
+    speeds are never stored between components. Requires numba.
+
+    The inputs and outputs are the union of those of the two components, except for the
+    flight path angle, which is computed internally and provided as an output.
+    """
+
+    def initialize(self):
+        self.options.declare("num_nodes", types=int)
+        self.options.declare(
+            "input_speed_type",
+            default=SpeedType.TAS,
+            types=SpeedType,
+            desc="tells whether the input airspeed is equivalent airspeed, true "
+            "airspeed, or mach number",
+        )
+        self.options.declare("ground_roll", types=bool, default=False,
+                             desc="True if the aircraft is confined to the ground. "
+                                  "The flight path angle does not affect the TAS rate.")
+
+    def setup(self):
+        if numba is None:
+            raise ImportError("numba package not found. You can install it by running "
+                              "'pip install numba'.")
+
+        nn = self.options["num_nodes"]
+        in_type = self.options["input_speed_type"]
+
+        self.add_input("dh_dr", shape=nn, units="m/distance_units",
+                       desc="change in altitude wrt range")
+        self.add_input("d2h_dr2", shape=nn, units="m/distance_units**2",
+                       desc="second derivative of altitude wrt range")
+        self.add_input("rho", val=np.zeros(nn), units="kg/m**3",
+                       desc="density of air")
+        self.add_input(_SOS, val=np.zeros(nn), units="m/s",
+                       desc="speed of sound")
+
+        self.add_output(_FPA, shape=nn, units="rad",
+                        desc="flight path angle")
+        self.add_output("dgam_dr", shape=nn, units="rad/distance_units",
+                        desc="change in flight path angle per unit range traversed")
+        self.add_output(_Q, val=np.zeros(nn), units="N/m**2",
+                        desc="dynamic pressure")
+        self.add_output("dTAS_dt_approx", val=np.zeros(nn), units="m/s**2",
+                        desc="approximated rate of change of true airspeed")
+
+        if in_type is SpeedType.TAS:
+            self.add_input("TAS", val=np.zeros(nn), units="m/s",
+                           desc="true air speed")
+            self.add_input("dTAS_dr", val=np.zeros(nn), units="m/s/distance_units",
+                           desc="change in true air speed per unit range")
+            self.add_output("EAS", val=np.zeros(nn), units="m/s",
+                            desc="equivalent air speed")
+            self.add_output(_MACH, val=np.zeros(nn), units="unitless",
+                            desc="mach number")
+        elif in_type is SpeedType.EAS:
+            self.add_input("EAS", val=np.zeros(nn), units="m/s",
+                           desc="equivalent air speed")
+            self.add_input("dEAS_dr", val=np.zeros(nn), units="1/s",
+                           desc="change in equivalent air speed per unit range")
+            self.add_input("drho_dh", val=np.zeros(nn), units="kg/m**4",
+                           desc="change in air density per unit altitude")
+            self.add_output("TAS", val=np.zeros(nn), units="m/s",
+                            desc="true air speed")
+            self.add_output(_MACH, val=np.zeros(nn), units="unitless",
+                            desc="mach number")
+        else:
+            self.add_input(_MACH, val=np.zeros(nn), units="unitless",
+                           desc="mach number")
+            self.add_input("dmach_dr", val=np.zeros(nn), units="unitless/distance_units",
+                           desc="change in mach number per unit range")
+            self.add_input("dsos_dh", val=np.zeros(nn), units="m/s/m",
+                           desc="change in speed of sound per unit altitude")
+            self.add_output("EAS", val=np.zeros(nn), units="m/s",
+                            desc="equivalent air speed")
+            self.add_output("TAS", val=np.zeros(nn), units="m/s",
+                            desc="true air speed")
+
+    def setup_partials(self):
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn, dtype=int)
+
+        for of, wrt in self._get_partials():
+            self.declare_partials(of=of, wrt=wrt, rows=ar, cols=ar)
+
+    def _get_partials(self):
+        partials = _PARTIALS[self.options["input_speed_type"]]
+        return partials[:-1] if self.options["ground_roll"] else partials
+
+    def _get_kernel_args(self, inputs):
+        in_type = self.options["input_speed_type"]
+
+        if in_type is SpeedType.TAS:
+            # dx_dh is unused, pass any input as a placeholder
+            v, dv_dr, dx_dh = inputs["TAS"], inputs["dTAS_dr"], inputs["TAS"]
+        elif in_type is SpeedType.EAS:
+            v, dv_dr, dx_dh = inputs["EAS"], inputs["dEAS_dr"], inputs["drho_dh"]
+        else:
+            v, dv_dr, dx_dh = inputs[_MACH], inputs["dmach_dr"], inputs["dsos_dh"]
+
+        return (_SPEED_MODES[in_type], self.options["ground_roll"],
+                inputs["dh_dr"], inputs["d2h_dr2"], inputs["rho"], inputs[_SOS],
+                v, dv_dr, dx_dh, constants.RHO_SEA_LEVEL_METRIC)
+
+    def compute(self, inputs, outputs):
+        in_type = self.options["input_speed_type"]
+
+        if in_type is SpeedType.TAS:
+            out_1, out_2 = outputs["EAS"], outputs[_MACH]
+        elif in_type is SpeedType.EAS:
+            out_1, out_2 = outputs["TAS"], outputs[_MACH]
+        else:
+            out_1, out_2 = outputs["EAS"], outputs["TAS"]
+
+        fused_kinematics(*self._get_kernel_args(inputs),
+                         outputs[_FPA], outputs["dgam_dr"], outputs[_Q],
+                         outputs["dTAS_dt_approx"], out_1, out_2)
+
+    def compute_partials(self, inputs, partials):
+        pairs = self._get_partials()
+        dh_dr = inputs["dh_dr"]
+        J = np.empty((len(_PARTIALS[self.options["input_speed_type"]]), dh_dr.size),
+                     dtype=dh_dr.dtype)
+
+        fused_kinematics_partials(*self._get_kernel_args(inputs), J)
+
+        for k, key in enumerate(pairs):
+            partials[key] = J[k]
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from dymos.models.atmosphere.atmos_1976 import USatm1976Comp
+from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
+
+from aviary.mission.gasp_based.ode.unsteady_solved.atmos_1976_table import \
+    AtmosTable1976, numba
+
+
+@unittest.skipIf(numba is None, "numba is not installed")
+class TestAtmosTable1976(unittest.TestCase):
+
+    def test_matches_dymos(self):
+        # include breakpoints, points between them, and extrapolation on both ends
+        h = np.array([-2000., -1000., 0., 500., 10000., 10123.4, 36089., 45000., 65617.,
+                      80000., 100000.])
+        nn = h.size
+
+        p = om.Problem()
+        p.model.add_subsystem("dymos_atmos",
+                              USatm1976Comp(num_nodes=nn, output_dsos_dh=True),
+                              promotes_inputs=["h"])
+        p.model.add_subsystem("table_atmos", AtmosTable1976(num_nodes=nn),
+                              promotes_inputs=["h"])
+
+        p.setup(force_alloc_complex=True)
+
+        p.set_val("h", h, units="ft")
+
+        p.run_model()
+
+        for name in ["temp", "pres", "rho", "viscosity", "drhos_dh", "sos", "dsos_dh"]:
+            with self.subTest(msg=name):
+                assert_near_equal(p.get_val(f"table_atmos.{name}"),
+                                  p.get_val(f"dymos_atmos.{name}"), tolerance=1.0E-12)
+
+        cpd = p.check_partials(method="cs", out_stream=None)
+        assert_check_partials(cpd)
+
+        J = p.compute_totals(of=["table_atmos.sos", "table_atmos.dsos_dh",
+                                 "table_atmos.drhos_dh"], wrt="h", return_format="array")
+        J_dymos = p.compute_totals(of=["dymos_atmos.sos", "dymos_atmos.dsos_dh",
+                                       "dymos_atmos.drhos_dh"], wrt="h",
+                                   return_format="array")
+        assert_near_equal(J, J_dymos, tolerance=1.0E-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import (assert_check_partials,
+                                         assert_near_equal)
+
+from aviary.mission.gasp_based.ode.unsteady_solved.fused_flight_kinematics import \
+    FusedFlightKinematics, numba
+from aviary.mission.gasp_based.ode.unsteady_solved.gamma_comp import GammaComp
+from aviary.mission.gasp_based.ode.unsteady_solved.unsteady_solved_flight_conditions import \
+    UnsteadySolvedFlightConditions
+from aviary.variable_info.enums import SpeedType
+from aviary.variable_info.variables import Dynamic
+
+_SPEED_INPUTS = {
+    SpeedType.TAS: (("TAS", 120., 20., "m/s"), ("dTAS_dr", 0., 1.e-3, "m/s/m")),
+    SpeedType.EAS: (("EAS", 120., 20., "m/s"), ("dEAS_dr", 0., 1.e-3, "1/s"),
+                    ("drho_dh", -1.e-4, 1.e-5, "kg/m**4")),
+    SpeedType.MACH: ((Dynamic.Mission.MACH, 0.6, 0.2, "unitless"),
+                     ("dmach_dr", 0., 1.e-5, "unitless/distance_units"),
+                     ("dsos_dh", -4.e-3, 1.e-4, "1/s")),
+}
+
+_SPEED_OUTPUTS = {
+    SpeedType.TAS: ("EAS", Dynamic.Mission.MACH),
+    SpeedType.EAS: ("TAS", Dynamic.Mission.MACH),
+    SpeedType.MACH: ("EAS", "TAS"),
+}
+
+
+@unittest.skipIf(numba is None, "numba is not installed")
+class TestFusedFlightKinematics(unittest.TestCase):
+
+    def _test_fused_flight_kinematics(self, ground_roll=False,
+                                      input_speed_type=SpeedType.TAS):
+        nn = 5
+
+        p = om.Problem()
+
+        # reference: the separate components
+        ref = p.model.add_subsystem("ref", om.Group(), promotes_inputs=["*"])
+        ref.add_subsystem("gamma", GammaComp(num_nodes=nn),
+                          promotes_inputs=["*"], promotes_outputs=["*"])
+        fc = UnsteadySolvedFlightConditions(num_nodes=nn, ground_roll=ground_roll,
+                                            input_speed_type=input_speed_type)
+        ref.add_subsystem("fc", fc, promotes_inputs=["*"], promotes_outputs=["*"])
+
+        p.model.add_subsystem("fused",
+                              FusedFlightKinematics(num_nodes=nn,
+                                                    ground_roll=ground_roll,
+                                                    input_speed_type=input_speed_type),
+                              promotes_inputs=["*"])
+
+        p.setup(force_alloc_complex=True)
+
+        p.set_val("dh_dr", 0.05 * np.random.rand(nn) - 0.025, units="m/m")
+        p.set_val("d2h_dr2", 1.e-5 * np.random.rand(nn), units="1/m")
+        p.set_val("rho", 0.4 + 0.8 * np.random.rand(nn), units="kg/m**3")
+        p.set_val(Dynamic.Mission.SPEED_OF_SOUND, 295. + 45. * np.random.rand(nn),
+                  units="m/s")
+
+        for name, val, spread, units in _SPEED_INPUTS[input_speed_type]:
+            p.set_val(name, val + spread * np.random.rand(nn), units=units)
+
+        p.run_model()
+
+        names = [Dynamic.Mission.FLIGHT_PATH_ANGLE, "dgam_dr",
+                 Dynamic.Mission.DYNAMIC_PRESSURE, "dTAS_dt_approx",
+                 *_SPEED_OUTPUTS[input_speed_type]]
+
+        for name in names:
+            with self.subTest(name=name):
+                assert_near_equal(p.get_val(f"fused.{name}"), p.get_val(f"ref.{name}"),
+                                  tolerance=1.0E-12)
+
+        cpd = p.check_partials(method="cs", includes=["fused"], out_stream=None)
+        assert_check_partials(cpd)
+
+    def test_fused_flight_kinematics(self):
+        for ground_roll in True, False:
+            for in_type in [SpeedType.TAS, SpeedType.EAS, SpeedType.MACH]:
+                with self.subTest(msg=f"ground_roll={ground_roll} in_type={in_type}"):
+                    self._test_fused_flight_kinematics(
+                        ground_roll=ground_roll, input_speed_type=in_type)
+
+
+if __name__ == '__main__':
+    unittest.main()
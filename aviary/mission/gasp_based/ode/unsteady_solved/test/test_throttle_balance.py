@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import (assert_check_partials,
+                                         assert_near_equal)
+
+from aviary.mission.gasp_based.ode.unsteady_solved.throttle_balance import \
+    ThrottleBalance
+from aviary.variable_info.variables import Dynamic
+
+
+class TestThrottleBalance(unittest.TestCase):
+
+    def test_throttle_balance(self):
+        nn = 5
+        thrust_ref = 4.0e4
+
+        p = om.Problem()
+        p.model.add_subsystem("bal",
+                              ThrottleBalance(num_nodes=nn, thrust_ref=thrust_ref,
+                                              bounded=True),
+                              promotes=["*"])
+
+        p.setup(force_alloc_complex=True)
+
+        thrust = 2.0e4 * np.random.rand(nn)
+        thrust_req = 2.0e4 * np.random.rand(nn)
+        p.set_val(Dynamic.Mission.THRUST_TOTAL, thrust, units="lbf")
+        p.set_val("thrust_req", thrust_req, units="lbf")
+
+        p.final_setup()
+        p.model.run_apply_nonlinear()
+
+        assert_near_equal(p.model.bal._residuals[Dynamic.Mission.THROTTLE],
+                          (thrust - thrust_req) / thrust_ref, tolerance=1.0E-12)
+
+        meta = p.model.bal._var_rel2meta[Dynamic.Mission.THROTTLE]
+        assert_near_equal(meta["lower"], np.zeros(nn))
+        assert_near_equal(meta["upper"], np.ones(nn))
+
+        cpd = p.check_partials(method="cs", out_stream=None)
+        assert_check_partials(cpd)
+
+
+if __name__ == '__main__':
+    unittest.main()
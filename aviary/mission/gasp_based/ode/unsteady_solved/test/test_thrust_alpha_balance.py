@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import (assert_check_partials,
+                                         assert_near_equal)
+
+from aviary.mission.gasp_based.ode.unsteady_solved.thrust_alpha_balance import \
+    ThrustAlphaBalance
+
+
+class TestThrustAlphaBalance(unittest.TestCase):
+
+    def _test_thrust_alpha_balance(self, ground_roll=False):
+        nn = 5
+        dgam_dt_ref = 1.0e-3
+        dTAS_dt_ref = 2.0
+
+        p = om.Problem()
+        p.model.add_subsystem("bal",
+                              ThrustAlphaBalance(num_nodes=nn, ground_roll=ground_roll,
+                                                 dgam_dt_ref=dgam_dt_ref,
+                                                 dTAS_dt_ref=dTAS_dt_ref),
+                              promotes=["*"])
+
+        p.setup(force_alloc_complex=True)
+
+        dTAS_dt_approx = np.random.rand(nn)
+        dTAS_dt = np.random.rand(nn)
+        p.set_val("dTAS_dt_approx", dTAS_dt_approx, units="m/s**2")
+        p.set_val("dTAS_dt", dTAS_dt, units="m/s**2")
+
+        if not ground_roll:
+            dgam_dt_approx = 0.01 * np.random.rand(nn)
+            dgam_dt = 0.01 * np.random.rand(nn)
+            p.set_val("dgam_dt_approx", dgam_dt_approx, units="rad/s")
+            p.set_val("dgam_dt", dgam_dt, units="rad/s")
+
+        p.final_setup()
+        p.model.run_apply_nonlinear()
+
+        residuals = p.model.bal._residuals
+
+        assert_near_equal(residuals["thrust_req"],
+                          (dTAS_dt_approx - dTAS_dt) / dTAS_dt_ref, tolerance=1.0E-12)
+
+        if ground_roll:
+            self.assertNotIn("alpha", p.model.bal._var_rel_names["output"])
+        else:
+            assert_near_equal(residuals["alpha"],
+                              (dgam_dt_approx - dgam_dt) / dgam_dt_ref,
+                              tolerance=1.0E-12)
+
+        cpd = p.check_partials(method="cs", out_stream=None)
+        assert_check_partials(cpd)
+
+    def test_thrust_alpha_balance(self):
+        for ground_roll in True, False:
+            with self.subTest(msg=f"ground_roll={ground_roll}"):
+                self._test_thrust_alpha_balance(ground_roll=ground_roll)
+
+
+if __name__ == '__main__':
+    unittest.main()
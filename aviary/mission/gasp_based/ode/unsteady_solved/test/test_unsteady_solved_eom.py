@@ -6,18 +6,18 @@ from openmdao.utils.assert_utils import (assert_check_partials,
                                          assert_near_equal)
 
 from aviary.mission.gasp_based.ode.unsteady_solved.unsteady_solved_eom import \
-    UnsteadySolvedEOM
+    UnsteadySolvedEOM, UnsteadySolvedEOMJIT
 from aviary.variable_info.variables import Aircraft, Dynamic, Mission
 
 
 class TestUnsteadySolvedEOM(unittest.TestCase):
 
-    def _test_unsteady_solved_eom(self, ground_roll=False):
+    def _test_unsteady_solved_eom(self, ground_roll=False, eom_class=UnsteadySolvedEOM):
         nn = 5
 
         p = om.Problem()
         p.model.add_subsystem("eom",
-                              UnsteadySolvedEOM(num_nodes=nn, ground_roll=ground_roll),
+                              eom_class(num_nodes=nn, ground_roll=ground_roll),
                               promotes_inputs=["*"],
                               promotes_outputs=["*"])
 
@@ -88,9 +88,41 @@ class TestUnsteadySolvedEOM(unittest.TestCase):
         assert_check_partials(cpd)
 
     def test_unsteady_solved_eom(self):
-        for ground_roll in True, False:
-            with self.subTest(msg=f"ground_roll={ground_roll}"):
-                self._test_unsteady_solved_eom(ground_roll=ground_roll)
+        for eom_class in UnsteadySolvedEOM, UnsteadySolvedEOMJIT:
+            for ground_roll in True, False:
+                msg = f"{eom_class.__name__}, ground_roll={ground_roll}"
+                with self.subTest(msg=msg):
+                    self._test_unsteady_solved_eom(ground_roll=ground_roll,
+                                                   eom_class=eom_class)
+
+    def test_zero_airspeed(self):
+        nn = 3
+
+        p = om.Problem()
+        for eom_class in UnsteadySolvedEOM, UnsteadySolvedEOMJIT:
+            p.model.add_subsystem(eom_class.__name__, eom_class(num_nodes=nn),
+                                  promotes_inputs=["*"])
+
+        p.setup()
+
+        p.set_val("TAS", [0.0, 1.0, 50.0], units="m/s")
+        p.set_val("mass", 175_000, units="lbm")
+        p.set_val(Dynamic.Mission.THRUST_TOTAL, 20_000, units="lbf")
+        p.set_val(Dynamic.Mission.LIFT, 175_000, units="lbf")
+        p.set_val(Dynamic.Mission.DRAG, 20_000, units="lbf")
+
+        # the compiled kernel returns inf/nan at zero airspeed like the NumPy version
+        # rather than raising ZeroDivisionError
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p.run_model()
+
+        for name in ("dt_dr", "dgam_dt"):
+            with self.subTest(name=name):
+                expected = p.get_val(f"UnsteadySolvedEOM.{name}")
+                actual = p.get_val(f"UnsteadySolvedEOMJIT.{name}")
+                self.assertFalse(np.isfinite(expected[0]))
+                np.testing.assert_array_equal(np.isfinite(actual), np.isfinite(expected))
+                assert_near_equal(actual[1:], expected[1:], tolerance=1.0E-12)
 
 
 if __name__ == '__main__':
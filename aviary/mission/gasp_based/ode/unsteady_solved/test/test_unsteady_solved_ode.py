@@ -2,12 +2,16 @@ import unittest
 
 import numpy as np
 import openmdao.api as om
-from openmdao.utils.assert_utils import assert_near_equal
+from dymos.models.atmosphere.atmos_1976 import USatm1976Comp
+from openmdao.utils.assert_utils import assert_check_partials, assert_near_equal
 
 from aviary.constants import GRAV_ENGLISH_LBM
 from aviary.mission.gasp_based.ode.params import ParamPort
+from aviary.mission.gasp_based.ode.unsteady_solved.atmos_1976_table import numba
 from aviary.mission.gasp_based.ode.unsteady_solved.unsteady_solved_ode import \
-    UnsteadySolvedODE
+    MassRateComp, UnsteadySolvedODE
+from aviary.mission.gasp_based.ode.unsteady_solved.unsteady_solvers import \
+    SubsolveArmijoGoldsteinLS
 from aviary.variable_info.options import get_option_defaults
 from aviary.variable_info.enums import SpeedType
 from aviary.variable_info.variables import Aircraft, Dynamic, Mission
@@ -18,7 +22,10 @@ from aviary.utils.test_utils.default_subsystems import get_default_mission_subsy
 class TestUnsteadySolvedODE(unittest.TestCase):
     """ Test the unsteady solved ODE in steady level flight. """
 
-    def _test_unsteady_solved_ode(self, ground_roll=False, input_speed_type=SpeedType.MACH, clean=True):
+    def _test_unsteady_solved_ode(self, ground_roll=False,
+                                  input_speed_type=SpeedType.MACH, clean=True,
+                                  atmos_backend='dymos', share_atmos=False,
+                                  use_fused_kinematics=False, ls_maxiter=0):
         nn = 5
 
         p = om.Problem()
@@ -31,9 +38,29 @@ class TestUnsteadySolvedODE(unittest.TestCase):
                                 input_speed_type=input_speed_type,
                                 clean=clean,
                                 ground_roll=ground_roll,
+                                atmos_backend=atmos_backend,
+                                share_atmos=share_atmos,
+                                use_fused_kinematics=use_fused_kinematics,
+                                ls_maxiter=ls_maxiter,
+                                # the balances below are checked to machine precision
+                                newton_atol=1.0e-10,
+                                newton_rtol=1.0e-10,
                                 aviary_options=aviary_options,
                                 core_subsystems=default_mission_subsystems)
 
+        if share_atmos:
+            p.model.add_subsystem(
+                "atmos",
+                USatm1976Comp(num_nodes=nn, output_dsos_dh=True),
+                promotes_inputs=[("h", Dynamic.Mission.ALTITUDE)],
+                promotes_outputs=[("rho", Dynamic.Mission.DENSITY),
+                                  ("sos", Dynamic.Mission.SPEED_OF_SOUND),
+                                  ("temp", Dynamic.Mission.TEMPERATURE),
+                                  ("pres", Dynamic.Mission.STATIC_PRESSURE),
+                                  "viscosity", "drhos_dh", "dsos_dh"])
+            p.model.set_input_defaults(Dynamic.Mission.ALTITUDE, 10000. * np.ones(nn),
+                                       units="ft")
+
         p.model.add_subsystem("ode", ode, promotes=["*"])
 
         # TODO: paramport
@@ -61,6 +88,11 @@ class TestUnsteadySolvedODE(unittest.TestCase):
 
         p.run_model()
 
+        self._check_steady_level_flight(p, ground_roll)
+
+        return p
+
+    def _check_steady_level_flight(self, p, ground_roll):
         drag = p.model.get_val(Dynamic.Mission.DRAG, units="lbf")
         lift = p.model.get_val(Dynamic.Mission.LIFT, units="lbf")
         thrust_req = p.model.get_val("thrust_req", units="lbf")
@@ -104,6 +136,173 @@ class TestUnsteadySolvedODE(unittest.TestCase):
             with self.subTest(msg=f"ground_roll={ground_roll}"):
                 self._test_unsteady_solved_ode(ground_roll=ground_roll)
 
+    def test_warm_start_after_failed_solve(self):
+        p = self._test_unsteady_solved_ode()
+        nn = 5
+
+        solver = p.model.ode.control_iter_group.nonlinear_solver
+        alpha = p.get_val("alpha", units="deg")
+        thrust_req = p.get_val("thrust_req", units="lbf")
+
+        # leave the solver unconverged at a far-off condition
+        solver.options["maxiter"] = 1
+        p.set_val("mass", 250_000 * np.ones(nn), units="lbm")
+        p.run_model()
+
+        # back at the original condition, the solve starts from the converged solution
+        solver.options["maxiter"] = 0
+        p.set_val("mass", 170_000 * np.ones(nn), units="lbm")
+        p.run_model()
+
+        assert_near_equal(p.get_val("alpha", units="deg"), alpha, tolerance=1.0E-12)
+        assert_near_equal(p.get_val("thrust_req", units="lbf"), thrust_req,
+                          tolerance=1.0E-12)
+
+    def test_warm_start_after_rtol_convergence(self):
+        p = self._test_unsteady_solved_ode()
+        nn = 5
+
+        solver = p.model.ode.control_iter_group.nonlinear_solver
+
+        # converge on rtol only, then evaluate the residuals before the next solve
+        solver.options["atol"] = 1.0e-30
+        p.set_val("mass", 171_000 * np.ones(nn), units="lbm")
+        p.run_model()
+        self.assertTrue(solver.converged)
+        p.model.run_apply_nonlinear()
+
+        alpha = p.get_val("alpha", units="deg")
+        thrust_req = p.get_val("thrust_req", units="lbf")
+
+        # leave the solver unconverged at a far-off condition
+        solver.options["maxiter"] = 1
+        p.set_val("mass", 250_000 * np.ones(nn), units="lbm")
+        p.run_model()
+        self.assertFalse(solver.converged)
+
+        # the rtol-converged solve is the one the next solve starts from
+        solver.options["maxiter"] = 0
+        p.set_val("mass", 171_000 * np.ones(nn), units="lbm")
+        p.run_model()
+
+        assert_near_equal(p.get_val("alpha", units="deg"), alpha, tolerance=1.0E-12)
+        assert_near_equal(p.get_val("thrust_req", units="lbf"), thrust_req,
+                          tolerance=1.0E-12)
+
+    def test_line_search(self):
+        p = self._test_unsteady_solved_ode()
+        self.assertIsInstance(p.model.ode.control_iter_group.nonlinear_solver.linesearch,
+                              om.BoundsEnforceLS)
+
+        num_iter = p.model.ode.control_iter_group.nonlinear_solver._iter_count
+
+        p = self._test_unsteady_solved_ode(ls_maxiter=5)
+        self.assertIsInstance(p.model.ode.control_iter_group.nonlinear_solver.linesearch,
+                              SubsolveArmijoGoldsteinLS)
+
+        # the full Newton steps are accepted
+        self.assertEqual(p.model.ode.control_iter_group.nonlinear_solver._iter_count,
+                         num_iter)
+
+    def test_steady_level_flight_shared_atmos(self):
+        p = self._test_unsteady_solved_ode(share_atmos=True)
+
+        names = [s.name for s in p.model.ode.system_iter(recurse=False)]
+        self.assertNotIn("USatm", names)
+
+    @unittest.skipIf(numba is None, "numba is not installed")
+    def test_steady_level_flight_numba_atmos(self):
+        self._test_unsteady_solved_ode(atmos_backend='numba')
+
+    @unittest.skipIf(numba is None, "numba is not installed")
+    def test_steady_level_flight_fused_kinematics(self):
+        self._test_unsteady_solved_ode(use_fused_kinematics=True)
+
+    def test_partials_are_diagonal(self):
+        p = self._test_unsteady_solved_ode()
+        nn = 5
+
+        # no partial couples different nodes: at most one stored entry per node, whether
+        # declared with rows/cols, as a diagonal, or with respect to a scalar input
+        for comp in p.model.ode.system_iter(recurse=True,
+                                            typ=(om.ExplicitComponent,
+                                                 om.ImplicitComponent)):
+            for key, meta in comp._subjacs_info.items():
+                with self.subTest(of=key[0], wrt=key[1]):
+                    self.assertLessEqual(np.size(meta["val"]), nn)
+
+
+class TestUnsteadySolvedODEClimb(unittest.TestCase):
+    """ Test the unsteady solved ODE on a climbing and accelerating trajectory. """
+
+    def test_climb(self):
+        nn = 10
+
+        p = om.Problem()
+
+        aviary_options = get_option_defaults()
+        default_mission_subsystems = get_default_mission_subsystems(
+            'GASP', build_engine_deck(aviary_options))
+
+        ode = UnsteadySolvedODE(num_nodes=nn,
+                                input_speed_type=SpeedType.MACH,
+                                clean=True,
+                                aviary_options=aviary_options,
+                                core_subsystems=default_mission_subsystems)
+
+        p.model.add_subsystem("ode", ode, promotes=["*"])
+
+        # TODO: paramport
+        param_port = ParamPort()
+        for key, data in param_port.param_data.items():
+            p.model.set_input_defaults(key, **data)
+        p.model.set_input_defaults(Dynamic.Mission.MACH, 0.8 * np.ones(nn))
+
+        p.setup()
+
+        # climb from 1,000 to 21,000 ft over 100 NM, accelerating from Mach 0.3 to 0.8
+        x = np.linspace(0.01, 1.0, nn)
+        p.set_val(Dynamic.Mission.ALTITUDE, 1000 + 20000 * x**1.5, units="ft")
+        p.set_val("dh_dr", 300 * x**0.5, units="ft/NM")
+        p.set_val("d2h_dr2", 1.5 / x**0.5, units="ft/NM**2")
+        p.set_val("mach", 0.3 + 0.5 * x, units="unitless")
+        p.set_val("dmach_dr", 0.005 * np.ones(nn), units="unitless/NM")
+        p.set_val("mass", 170_000 * np.ones(nn), units="lbm")
+        p.set_val("alpha", 4 * np.ones(nn), units="deg")
+        p.set_val("thrust_req", 8000 * np.ones(nn), units="lbf")
+
+        p.run_model()
+
+        # the balances hold along the whole trajectory
+        for name in ("dTAS_dt", "dgam_dt"):
+            with self.subTest(name=name):
+                assert_near_equal(p.get_val(name), p.get_val(f"{name}_approx"),
+                                  tolerance=1.0E-6)
+
+
+class TestMassRateComp(unittest.TestCase):
+
+    def test_mass_rate(self):
+        nn = 5
+
+        p = om.Problem()
+        p.model.add_subsystem("mass_rate", MassRateComp(num_nodes=nn), promotes=["*"])
+
+        p.setup(force_alloc_complex=True)
+
+        fuelflow = -(1.0 + np.random.rand(nn))
+        dt_dr = 0.002 + 0.001 * np.random.rand(nn)
+        p.set_val("fuelflow", fuelflow, units="lbm/s")
+        p.set_val("dt_dr", dt_dr, units="s/ft")
+
+        p.run_model()
+
+        assert_near_equal(p.get_val("dmass_dr", units="lbm/ft"),
+                          fuelflow * dt_dr, tolerance=1.0E-12)
+
+        cpd = p.check_partials(method="cs", out_stream=None)
+        assert_check_partials(cpd)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+
+import numpy as np
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+from openmdao.utils.om_warnings import SolverWarning
+
+from aviary.mission.gasp_based.ode.unsteady_solved.unsteady_solvers import \
+    ModifiedNewtonSolver, SubsolveArmijoGoldsteinLS
+
+
+class CubicComp(om.ImplicitComponent):
+    """ Residual x**3 + x - c with diagonal partials, counting linearizations. """
+
+    def initialize(self):
+        self.options.declare("num_nodes", types=int)
+        self.num_linearize = 0
+
+    def setup(self):
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn, dtype=int)
+
+        self.add_input("c", shape=nn)
+        self.add_output("x", val=np.ones(nn))
+
+        self.declare_partials("x", "c", rows=ar, cols=ar, val=-1.0)
+        self.declare_partials("x", "x", rows=ar, cols=ar)
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        x = outputs["x"]
+        residuals["x"] = x**3 + x - inputs["c"]
+
+    def linearize(self, inputs, outputs, partials):
+        self.num_linearize += 1
+        partials["x", "x"] = 3 * outputs["x"]**2 + 1
+
+
+class TestModifiedNewtonSolver(unittest.TestCase):
+
+    def _solve(self, refresh_interval):
+        nn = 5
+
+        p = om.Problem()
+        comp = p.model.add_subsystem("cubic", CubicComp(num_nodes=nn), promotes=["*"])
+
+        p.model.nonlinear_solver = ModifiedNewtonSolver(
+            solve_subsystems=False, atol=1.0e-12, rtol=1.0e-12, maxiter=50, iprint=-1,
+            refresh_interval=refresh_interval)
+        p.model.linear_solver = om.DirectSolver(assemble_jac=True)
+
+        p.setup()
+
+        # start from x = 1, close enough for the frozen Jacobian to contract
+        x_expected = np.linspace(1.0, 1.4, nn)
+        p.set_val("c", x_expected**3 + x_expected)
+
+        p.run_model()
+
+        assert_near_equal(p.get_val("x"), x_expected, tolerance=1.0E-10)
+
+        return comp.num_linearize, p.model.nonlinear_solver._iter_count
+
+    def test_refresh_interval(self):
+        num_lin_newton, num_iter_newton = self._solve(refresh_interval=1)
+        num_lin_modified, num_iter_modified = self._solve(refresh_interval=3)
+
+        # standard Newton linearizes at every iteration
+        self.assertEqual(num_lin_newton, num_iter_newton)
+
+        # modified Newton only linearizes on every third iteration
+        self.assertEqual(num_lin_modified, int(np.ceil(num_iter_modified / 3)))
+        self.assertLess(num_lin_modified, num_lin_newton)
+
+    def test_failure_warns(self):
+        p = om.Problem()
+        p.model.add_subsystem("cubic", CubicComp(num_nodes=5), promotes=["*"])
+
+        p.model.nonlinear_solver = ModifiedNewtonSolver(solve_subsystems=False,
+                                                        maxiter=1,
+                                                        iprint=-1)
+        p.model.linear_solver = om.DirectSolver(assemble_jac=True)
+
+        p.setup()
+        p.set_val("c", 10.0 * np.ones(5))
+
+        with self.assertWarns(SolverWarning):
+            p.run_model()
+
+
+class TestSubsolveArmijoGoldsteinLS(unittest.TestCase):
+
+    def _solve(self, linesearch):
+        nn = 5
+
+        p = om.Problem()
+        p.model.add_subsystem("cube", om.ExecComp("y = x**3", has_diag_partials=True,
+                                                  x=np.ones(nn), y=np.ones(nn)),
+                              promotes=["*"])
+        # as in the ODE, the balance residual is scaled but the explicit output is not
+        p.model.add_subsystem("bal", om.BalanceComp("x", val=np.ones(nn), lhs_name="y",
+                                                    rhs_name="c", res_ref=100.0),
+                              promotes=["*"])
+
+        p.model.nonlinear_solver = ModifiedNewtonSolver(solve_subsystems=True,
+                                                        atol=1.0e-12,
+                                                        rtol=1.0e-12,
+                                                        maxiter=50,
+                                                        iprint=-1,
+                                                        refresh_interval=1)
+        p.model.nonlinear_solver.linesearch = linesearch
+        p.model.linear_solver = om.DirectSolver(assemble_jac=True)
+
+        p.setup()
+
+        x_expected = np.linspace(1.5, 2.0, nn)
+        p.set_val("c", x_expected**3)
+
+        p.run_model()
+
+        assert_near_equal(p.get_val("x"), x_expected, tolerance=1.0E-10)
+
+        return p.model.nonlinear_solver._iter_count
+
+    def test_full_step_accepted(self):
+        num_iter_newton = self._solve(om.BoundsEnforceLS())
+        num_iter_armijo = self._solve(SubsolveArmijoGoldsteinLS(maxiter=5, c=1.0e-4))
+
+        # the sub-solve removes the linearization error of "y" at the full step, so the
+        # line search does not reject good Newton steps because of it
+        self.assertLessEqual(num_iter_armijo, num_iter_newton)
+
+
+if __name__ == "__main__":
+    unittest.main()
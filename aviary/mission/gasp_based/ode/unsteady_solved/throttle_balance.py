@@ -0,0 +1,57 @@
+import numpy as np
+import openmdao.api as om
+
+from aviary.variable_info.variables import Dynamic
+
+
+class ThrottleBalance(om.ImplicitComponent):
+    """
+    Solve for the throttle that makes the total thrust of the propulsion system match
+    the thrust required by the equations of motion.
+
+    The residual (thrust_total - thrust_req) / thrust_ref is scaled by a fixed
+    reference thrust, so its partials are constant and the throttle balance needs no
+    residual scaling from its parent.
+    """
+
+    def initialize(self):
+        self.options.declare("num_nodes", types=int)
+        self.options.declare("thrust_ref", types=float, default=1.0e6, lower=1.0e-10,
+                             desc="Typical magnitude of the thrust, in lbf, used to "
+                                  "scale the residual.")
+        self.options.declare("bounded", types=bool, default=False,
+                             desc="If True, the throttle is limited to [0, 1] by the "
+                                  "solver bounds.")
+
+    def setup(self):
+        nn = self.options["num_nodes"]
+        bounded = self.options["bounded"]
+
+        self.add_input(Dynamic.Mission.THRUST_TOTAL, shape=nn, units="lbf",
+                       desc="total thrust of the propulsion system")
+        self.add_input("thrust_req", shape=nn, units="lbf",
+                       desc="thrust required to fly the given trajectory")
+
+        self.add_output(Dynamic.Mission.THROTTLE, shape=nn, val=0.5, units="unitless",
+                        lower=0.0 if bounded else None,
+                        upper=1.0 if bounded else None,
+                        desc="engine throttle setting")
+
+    def setup_partials(self):
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn, dtype=int)
+
+        self._inv_scale = np.full(nn, 1.0 / self.options["thrust_ref"])
+
+        # the residual is linear in the inputs, so the partials are constant
+        self.declare_partials(of=Dynamic.Mission.THROTTLE,
+                              wrt=Dynamic.Mission.THRUST_TOTAL,
+                              rows=ar, cols=ar, val=self._inv_scale)
+        self.declare_partials(of=Dynamic.Mission.THROTTLE, wrt="thrust_req",
+                              rows=ar, cols=ar, val=-self._inv_scale)
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        res = residuals[Dynamic.Mission.THROTTLE]
+        np.subtract(inputs[Dynamic.Mission.THRUST_TOTAL], inputs["thrust_req"],
+                    out=res)
+        res *= self._inv_scale
@@ -0,0 +1,78 @@
+import numpy as np
+import openmdao.api as om
+
+
+class ThrustAlphaBalance(om.ImplicitComponent):
+    """
+    Solve for the alpha and required thrust that make the approximate rates of change
+    of flight path angle and true airspeed match those given by the equations of motion.
+
+    This is equivalent to a BalanceComp with one unnormalized balance for each of alpha
+    and thrust_req, with both residuals computed in a single component. Each residual is
+    divided by a fixed reference rate so that both are of order one. In ground roll
+    there is no alpha balance.
+    """
+
+    def initialize(self):
+        self.options.declare("num_nodes", types=int)
+        self.options.declare("ground_roll", types=bool, default=False,
+                             desc="True if the aircraft is confined to the ground. "
+                                  "Removes alpha and its balance.")
+        self.options.declare("dgam_dt_ref", types=float, default=1.0, lower=1.0e-10,
+                             desc="Typical magnitude of the rate of change of flight "
+                                  "path angle, in rad/s, used to scale the alpha "
+                                  "residual.")
+        self.options.declare("dTAS_dt_ref", types=float, default=1.0, lower=1.0e-10,
+                             desc="Typical magnitude of the rate of change of true "
+                                  "airspeed, in m/s**2, used to scale the thrust_req "
+                                  "residual.")
+
+    def setup(self):
+        nn = self.options["num_nodes"]
+
+        if not self.options["ground_roll"]:
+            self.add_input("dgam_dt_approx", shape=nn, units="rad/s",
+                           desc="approximate rate of change of flight path angle")
+            self.add_input("dgam_dt", shape=nn, units="rad/s",
+                           desc="rate of change of flight path angle from the EOM")
+
+            self.add_output("alpha", shape=nn, val=0.0, units="rad",
+                            lower=-np.pi/12, upper=np.pi/12,
+                            desc="angle of attack")
+
+        self.add_input("dTAS_dt_approx", shape=nn, units="m/s**2",
+                       desc="approximate rate of change of true airspeed")
+        self.add_input("dTAS_dt", shape=nn, units="m/s**2",
+                       desc="rate of change of true airspeed from the EOM")
+
+        self.add_output("thrust_req", shape=nn, val=100.0, units="N",
+                        desc="thrust required to fly the given trajectory")
+
+    def setup_partials(self):
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn, dtype=int)
+
+        self._inv_dgam_dt_ref = 1.0 / self.options["dgam_dt_ref"]
+        self._inv_dTAS_dt_ref = 1.0 / self.options["dTAS_dt_ref"]
+
+        # the residuals are linear in the inputs, so the partials are constant
+        if not self.options["ground_roll"]:
+            self.declare_partials(of="alpha", wrt="dgam_dt_approx", rows=ar, cols=ar,
+                                  val=self._inv_dgam_dt_ref)
+            self.declare_partials(of="alpha", wrt="dgam_dt", rows=ar, cols=ar,
+                                  val=-self._inv_dgam_dt_ref)
+
+        self.declare_partials(of="thrust_req", wrt="dTAS_dt_approx", rows=ar, cols=ar,
+                              val=self._inv_dTAS_dt_ref)
+        self.declare_partials(of="thrust_req", wrt="dTAS_dt", rows=ar, cols=ar,
+                              val=-self._inv_dTAS_dt_ref)
+
+    def apply_nonlinear(self, inputs, outputs, residuals):
+        if not self.options["ground_roll"]:
+            res = residuals["alpha"]
+            np.subtract(inputs["dgam_dt_approx"], inputs["dgam_dt"], out=res)
+            res *= self._inv_dgam_dt_ref
+
+        res = residuals["thrust_req"]
+        np.subtract(inputs["dTAS_dt_approx"], inputs["dTAS_dt"], out=res)
+        res *= self._inv_dTAS_dt_ref
@@ -54,10 +54,12 @@ class UnsteadyControlIterGroup(om.Group):
         for subsystem in core_subsystems:
             system = subsystem.build_mission(**kwargs)
             if system is not None:
+                mission_inputs = subsystem.mission_inputs(**kwargs)
+                mission_outputs = subsystem.mission_outputs(**kwargs)
                 self.add_subsystem(subsystem.name,
                                    system,
-                                   promotes_inputs=subsystem.mission_inputs(**kwargs),
-                                   promotes_outputs=subsystem.mission_outputs(**kwargs))
+                                   promotes_inputs=mission_inputs,
+                                   promotes_outputs=mission_outputs)
 
         eom_comp = UnsteadySolvedEOM(num_nodes=nn, ground_roll=ground_roll)
 
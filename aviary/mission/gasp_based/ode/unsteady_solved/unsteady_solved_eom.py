@@ -6,6 +6,11 @@ from aviary.constants import GRAV_METRIC_GASP, GRAV_ENGLISH_LBM, MU_TAKEOFF
 from aviary.variable_info.functions import add_aviary_input
 from aviary.variable_info.variables import Aircraft, Dynamic
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
 LBF_TO_N = convert_units(1.0, 'lbf', 'N')
 
 
@@ -302,3 +307,93 @@ class UnsteadySolvedEOM(om.ExplicitComponent):
                      Dynamic.Mission.FLIGHT_PATH_ANGLE] = dgam_dr * drdot_dgam
             partials["load_factor", Dynamic.Mission.FLIGHT_PATH_ANGLE] = (
                 lift + tsai) / (weight * cgam**2) * sgam
+
+
+def _eom_kernel(tas, gamma, alpha, i_wing, thrust, mass, drag, lift, dh_dr, d2h_dr2,
+                mu, ground_roll, out_dt_dr, out_normal_force, out_dTAS_dt,
+                out_fuselage_pitch, out_load_factor, out_dgam_dt, out_dgam_dt_approx):
+    """
+    Evaluate the UnsteadySolvedEOM outputs node by node, writing into the given output
+    arrays. When ground_roll is True, gamma is ignored and the dgam outputs are not
+    written.
+    """
+    g = GRAV_METRIC_GASP
+    for i in range(tas.shape[0]):
+        weight = mass[i] * GRAV_ENGLISH_LBM * LBF_TO_N
+        m = weight / g
+
+        if ground_roll:
+            gam = 0.0 * tas[i]
+        else:
+            gam = gamma[i]
+
+        cgam = np.cos(gam)
+        sgam = np.sin(gam)
+
+        alpha_i = alpha[i] - i_wing
+        tcai = thrust[i] * np.cos(alpha_i)
+        tsai = thrust[i] * np.sin(alpha_i)
+
+        dr_dt = tas[i] * cgam
+        normal_force = weight - lift[i] - tsai
+
+        out_dt_dr[i] = 1.0 / dr_dt
+        out_normal_force[i] = normal_force
+        out_dTAS_dt[i] = (tcai - drag[i] - weight * sgam - mu * normal_force) / m
+        out_fuselage_pitch[i] = gam - i_wing + alpha[i]
+        out_load_factor[i] = (lift[i] + tsai) / (weight * cgam)
+
+        if not ground_roll:
+            out_dgam_dt[i] = (tsai + lift[i] - weight * cgam) / (m * tas[i])
+            out_dgam_dt_approx[i] = d2h_dr2[i] / (dh_dr[i] ** 2 + 1) * dr_dt
+
+
+if numba is not None:
+    # the numpy error model returns inf/nan on division by zero (e.g. at TAS = 0) like
+    # UnsteadySolvedEOM, instead of raising ZeroDivisionError. The fast-math flags leave
+    # out nnan and ninf, so that those values are not optimized away.
+    eom_kernel = numba.njit(cache=True, fastmath={'contract', 'arcp', 'reassoc'},
+                            error_model="numpy")(_eom_kernel)
+
+    # Compile the real-valued specialization up front so that the first model
+    # evaluation does not pay for it.
+    _one = np.ones(1)
+    eom_kernel(_one, _one, _one, 0.0, _one, _one, _one, _one, _one, _one, 0.0, False,
+               _one.copy(), _one.copy(), _one.copy(), _one.copy(), _one.copy(),
+               _one.copy(), _one.copy())
+    del _one
+else:
+    eom_kernel = _eom_kernel
+
+
+class UnsteadySolvedEOMJIT(UnsteadySolvedEOM):
+    """
+    UnsteadySolvedEOM whose outputs are computed in a single fused pass over the nodes.
+    The kernel is compiled with numba when it is installed; otherwise it runs as plain
+    Python, so UnsteadySolvedEOM should be preferred in that case.
+    """
+
+    def compute(self, inputs, outputs):
+        ground_roll = self.options["ground_roll"]
+        tas = inputs["TAS"]
+
+        if ground_roll:
+            mu = MU_TAKEOFF
+            # placeholders for the unused flight path inputs and outputs
+            gamma = dh_dr = d2h_dr2 = tas
+            dgam_dt = dgam_dt_approx = outputs["dTAS_dt"]
+        else:
+            mu = 0.0
+            gamma = inputs[Dynamic.Mission.FLIGHT_PATH_ANGLE]
+            dh_dr = inputs["dh_dr"]
+            d2h_dr2 = inputs["d2h_dr2"]
+            dgam_dt = outputs["dgam_dt"]
+            dgam_dt_approx = outputs["dgam_dt_approx"]
+
+        eom_kernel(tas, gamma, inputs["alpha"], inputs[Aircraft.Wing.INCIDENCE][0],
+                   inputs[Dynamic.Mission.THRUST_TOTAL], inputs["mass"],
+                   inputs[Dynamic.Mission.DRAG], inputs[Dynamic.Mission.LIFT],
+                   dh_dr, d2h_dr2, mu, ground_roll,
+                   outputs["dt_dr"], outputs["normal_force"], outputs["dTAS_dt"],
+                   outputs["fuselage_pitch"], outputs["load_factor"],
+                   dgam_dt, dgam_dt_approx)
@@ -4,19 +4,129 @@ from dymos.models.atmosphere.atmos_1976 import USatm1976Comp
 
 from aviary.constants import RHO_SEA_LEVEL_ENGLISH as rho_sl
 from aviary.mission.gasp_based.ode.base_ode import BaseODE
+from aviary.mission.gasp_based.ode.unsteady_solved.atmos_1976_table import AtmosTable1976
+from aviary.mission.gasp_based.ode.unsteady_solved.fused_flight_kinematics import \
+    FusedFlightKinematics
 from aviary.mission.gasp_based.ode.params import ParamPort
 from aviary.mission.gasp_based.ode.unsteady_solved.gamma_comp import GammaComp
 from aviary.mission.gasp_based.ode.unsteady_solved.unsteady_solved_flight_conditions import \
     UnsteadySolvedFlightConditions
-from aviary.mission.gasp_based.ode.unsteady_solved.unsteady_solved_eom import UnsteadySolvedEOM
+from aviary.mission.gasp_based.ode.unsteady_solved.unsteady_solved_eom import \
+    UnsteadySolvedEOM, UnsteadySolvedEOMJIT, numba
+from aviary.mission.gasp_based.ode.unsteady_solved.unsteady_solvers import \
+    ModifiedNewtonSolver, SubsolveArmijoGoldsteinLS
+from aviary.mission.gasp_based.ode.unsteady_solved.throttle_balance import \
+    ThrottleBalance
+from aviary.mission.gasp_based.ode.unsteady_solved.thrust_alpha_balance import \
+    ThrustAlphaBalance
 from aviary.variable_info.enums import SpeedType, LegacyCode
-from aviary.variable_info.variables import Dynamic
+from aviary.variable_info.variables import Aircraft, Dynamic
 from aviary.variable_info.variables_in import VariablesIn
 from aviary.subsystems.aerodynamics.aerodynamics_builder import AerodynamicsBuilderBase
 from aviary.subsystems.propulsion.propulsion_builder import PropulsionBuilderBase
 from aviary.variable_info.variable_meta_data import _MetaData
 
 
+def _typical_thrust(aviary_options):
+    """
+    Return the total sea level static thrust of the engines in lbf, or the reference
+    thrust formerly used to scale the throttle residual if it is not available.
+    """
+    try:
+        total_thrust = np.sum(
+            aviary_options.get_val(Aircraft.Engine.SCALED_SLS_THRUST, 'lbf') *
+            aviary_options.get_val(Aircraft.Engine.NUM_ENGINES))
+    except KeyError:
+        total_thrust = 0.0
+
+    return float(total_thrust) if total_thrust > 0.0 else 1.0e6
+
+
+class MassRateComp(om.ExplicitComponent):
+    """
+    Compute the rate of change of mass per unit range from the fuel flow rate and the
+    time spent per unit range: dmass_dr = fuelflow * dt_dr.
+    """
+
+    def initialize(self):
+        self.options.declare("num_nodes", types=int)
+
+    def setup(self):
+        nn = self.options["num_nodes"]
+
+        self.add_input("fuelflow", shape=nn, units="lbm/s",
+                       desc="rate of change of mass due to fuel burn")
+        self.add_input("dt_dr", shape=nn, units="s/distance_units",
+                       desc="seconds passed per unit of range covered")
+
+        self.add_output("dmass_dr", shape=nn, units="lbm/distance_units",
+                        desc="rate of change of mass per unit range",
+                        tags=['dymos.state_rate_source:mass',
+                              'dymos.state_units:lbm'])
+
+    def setup_partials(self):
+        nn = self.options["num_nodes"]
+        ar = np.arange(nn, dtype=int)
+
+        self.declare_partials(of="dmass_dr", wrt=["fuelflow", "dt_dr"],
+                              rows=ar, cols=ar)
+
+    def compute(self, inputs, outputs):
+        np.multiply(inputs["fuelflow"], inputs["dt_dr"], out=outputs["dmass_dr"])
+
+    def compute_partials(self, inputs, partials):
+        partials["dmass_dr", "fuelflow"] = inputs["dt_dr"]
+        partials["dmass_dr", "dt_dr"] = inputs["fuelflow"]
+
+
+class WarmStartGroup(om.Group):
+    """
+    Group whose Newton solve starts from the last converged solution of the given
+    outputs.
+
+    OpenMDAO starts each solve from whatever the outputs held at the end of the
+    previous one. When that solve did not converge, those values are a poor starting
+    point, so they are replaced by the cached values from the last converged solve.
+    The nonlinear solver must be a ModifiedNewtonSolver, which reports whether each
+    solve converged.
+    """
+
+    def initialize(self):
+        self.options.declare("warm_start_outputs", types=list, default=[],
+                             desc="promoted names of the outputs to warm start")
+
+    def setup(self):
+        self._warm_cache = {}
+        self._converged = True
+
+    def _solve_nonlinear(self):
+        if self.under_complex_step:
+            super()._solve_nonlinear()
+            return
+
+        # cleared until the solve returns, so that one raising an AnalysisError counts
+        # as a failure
+        self._converged = False
+
+        super()._solve_nonlinear()
+
+        self._converged = self.nonlinear_solver.converged
+
+        # cache right after the solve, before anything else changes the outputs
+        if self._converged:
+            with self._unscaled_context(outputs=[self._outputs]):
+                for name in self.options["warm_start_outputs"]:
+                    self._warm_cache[name] = self._outputs[name].copy()
+
+    def guess_nonlinear(self, inputs, outputs, residuals):
+        if self.under_complex_step:
+            return
+
+        if not self._converged and self._warm_cache:
+            for name in self.options["warm_start_outputs"]:
+                outputs[name] = self._warm_cache[name]
+
+
 class UnsteadySolvedODE(BaseODE):
     """ This 2D aircraft ODE provides the rate of change of time per unit range covered.
 
@@ -33,6 +143,23 @@ class UnsteadySolvedODE(BaseODE):
     settings.
     """
 
+    # promoted inputs and outputs of the flight conditions component for each input
+    # speed type, in addition to the ones common to all of them
+    _FC_INPUTS = {
+        SpeedType.TAS: (('TAS', Dynamic.Mission.VELOCITY), 'dTAS_dr'),
+        SpeedType.EAS: ('EAS', 'dEAS_dr', 'drho_dh'),
+        SpeedType.MACH: (Dynamic.Mission.MACH, 'dmach_dr', 'dsos_dh'),
+    }
+    _FC_OUTPUTS = {
+        SpeedType.TAS: ('EAS', Dynamic.Mission.MACH),
+        SpeedType.EAS: (('TAS', Dynamic.Mission.VELOCITY), Dynamic.Mission.MACH),
+        SpeedType.MACH: ('EAS', ('TAS', Dynamic.Mission.VELOCITY)),
+    }
+
+    # default kwargs passed to the subsystem builders, copied into each setup and never
+    # modified in place
+    _BASE_KWARGS_TEMPLATE = {'method': 'low_speed'}
+
     def initialize(self):
         super().initialize()
         self.options.declare(
@@ -61,6 +188,78 @@ class UnsteadySolvedODE(BaseODE):
             values=['path_constraint', 'boundary_constraint', 'bounded', None],
             desc='flag to enforce throttle constraints on the path or at the segment boundaries or using solver bounds'
         )
+        self.options.declare(
+            "jit_eom",
+            types=bool,
+            default=True,
+            desc="If true and numba is installed, evaluate the equations of motion with "
+            "a compiled kernel. Otherwise the NumPy implementation is used.")
+        self.options.declare(
+            "modified_newton_refresh",
+            types=int,
+            default=1,
+            lower=1,
+            desc="Number of Newton iterations between Jacobian updates in the "
+            "alpha/thrust solver. The default of 1 relinearizes at every iteration "
+            "(standard Newton); larger values skip relinearization and refactorization "
+            "in between.")
+        self.options.declare(
+            "ls_rho",
+            types=float,
+            default=0.5,
+            desc="Backtracking contraction factor of the line search used by the "
+            "alpha/thrust solver. Only used if ls_maxiter is positive.")
+        self.options.declare(
+            "ls_maxiter",
+            types=int,
+            default=0,
+            lower=0,
+            desc="Maximum number of backtracking steps of the line search used by the "
+            "alpha/thrust solver. If positive, an Armijo-Goldstein line search is used. "
+            "The default of 0 takes the full Newton step and only enforces the bounds "
+            "on alpha.")
+        self.options.declare(
+            "newton_atol",
+            types=float,
+            default=1.0e-8,
+            desc="Absolute tolerance of the alpha/thrust and throttle Newton solvers. "
+            "The residuals are scaled by typical values, so this applies to all of them "
+            "alike.")
+        self.options.declare(
+            "newton_rtol",
+            types=float,
+            default=1.0e-8,
+            desc="Relative tolerance of the alpha/thrust and throttle Newton solvers.")
+        self.options.declare(
+            "newton_maxiter",
+            types=int,
+            default=15,
+            lower=0,
+            desc="Maximum number of iterations of the alpha/thrust and throttle Newton "
+            "solvers.")
+        self.options.declare(
+            "share_atmos",
+            types=bool,
+            default=False,
+            desc="If true, no atmosphere model is added to this ODE and the atmospheric "
+            "properties (density, speed of sound, temperature, static pressure, "
+            "viscosity, drhos_dh and dsos_dh) become inputs to be connected from an "
+            "atmosphere evaluated once by the parent model. Intended for ODEs embedded "
+            "in a larger model, so include_param_comp should be False in this mode.")
+        self.options.declare(
+            "atmos_backend",
+            default="dymos",
+            values=["dymos", "numba"],
+            desc="Implementation of the 1976 standard atmosphere. 'dymos' uses "
+            "USatm1976Comp, 'numba' evaluates the same tables with a compiled kernel "
+            "(requires numba).")
+        self.options.declare(
+            "use_fused_kinematics",
+            types=bool,
+            default=False,
+            desc="If true, compute the flight path angle and the flight conditions in a "
+            "single compiled component (requires numba) instead of GammaComp and "
+            "UnsteadySolvedFlightConditions.")
         self.options.declare(
             'external_subsystems', default=[],
             desc='list of external subsystem builder instances to be added to the ODE')
@@ -68,6 +267,23 @@ class UnsteadySolvedODE(BaseODE):
             'meta_data', default=_MetaData,
             desc='metadata associated with the variables to be passed into the ODE')
 
+    def _flight_path_inputs(self):
+        """
+        Return the flight path angle inputs of the flight conditions, which are only
+        present in flight.
+        """
+        if self.options["ground_roll"]:
+            return []
+        return [Dynamic.Mission.FLIGHT_PATH_ANGLE]
+
+    def _balance_outputs(self):
+        """
+        Return the outputs solved for by control_iter_group.
+        """
+        if self.options["ground_roll"]:
+            return ["thrust_req"]
+        return ["alpha", "thrust_req"]
+
     def setup(self):
         nn = self.options["num_nodes"]
         ground_roll = self.options["ground_roll"]
@@ -79,7 +295,9 @@ class UnsteadySolvedODE(BaseODE):
 
         if self.options["include_param_comp"]:
             # TODO: paramport
-            self.add_subsystem("params", ParamPort(), promotes=["*"])
+            # ParamPort.add_params can extend the parameters, so they are listed here
+            self.add_subsystem("params", ParamPort(),
+                               promotes=list(ParamPort.param_data))
 
             self.add_subsystem(
                 'input_port',
@@ -87,50 +305,66 @@ class UnsteadySolvedODE(BaseODE):
                 promotes_inputs=['*'],
                 promotes_outputs=['*'])
 
-        self.add_subsystem(
-            "USatm",
-            USatm1976Comp(
-                num_nodes=nn, output_dsos_dh=True),
-            promotes_inputs=[
-                ("h",
-                 Dynamic.Mission.ALTITUDE)],
-            promotes_outputs=[
-                ("rho", Dynamic.Mission.DENSITY),
-                ("sos",
-                 Dynamic.Mission.SPEED_OF_SOUND),
-                ("temp",
-                 Dynamic.Mission.TEMPERATURE),
-                ("pres",
-                 Dynamic.Mission.STATIC_PRESSURE),
-                "viscosity",
-                "drhos_dh",
-                "dsos_dh",
-            ],
-        )
+        if not self.options['share_atmos']:
+            if self.options['atmos_backend'] == 'numba':
+                atmos = AtmosTable1976(num_nodes=nn)
+            else:
+                atmos = USatm1976Comp(num_nodes=nn, output_dsos_dh=True)
+
+            self.add_subsystem(
+                "USatm",
+                atmos,
+                promotes_inputs=[
+                    ("h",
+                     Dynamic.Mission.ALTITUDE)],
+                promotes_outputs=[
+                    ("rho", Dynamic.Mission.DENSITY),
+                    ("sos",
+                     Dynamic.Mission.SPEED_OF_SOUND),
+                    ("temp",
+                     Dynamic.Mission.TEMPERATURE),
+                    ("pres",
+                     Dynamic.Mission.STATIC_PRESSURE),
+                    "viscosity",
+                    "drhos_dh",
+                    "dsos_dh",
+                ],
+            )
 
-        self.add_subsystem("flight_path_angle",
-                           GammaComp(num_nodes=nn),
-                           promotes_inputs=["*"],
-                           promotes_outputs=["*"])
+        inputs_list = [('rho', Dynamic.Mission.DENSITY), Dynamic.Mission.SPEED_OF_SOUND,
+                       *self._FC_INPUTS[input_speed_type]]
+        outputs_list = [Dynamic.Mission.DYNAMIC_PRESSURE, 'dTAS_dt_approx',
+                        *self._FC_OUTPUTS[input_speed_type]]
 
-        inputs_list = ['*', ('rho', Dynamic.Mission.DENSITY)]
-        outputs_list = ['*']
-        if input_speed_type is SpeedType.TAS:
-            inputs_list.append(('TAS', Dynamic.Mission.VELOCITY))
+        if self.options["use_fused_kinematics"]:
+            self.add_subsystem(
+                "flight_kinematics",
+                FusedFlightKinematics(num_nodes=nn,
+                                      ground_roll=ground_roll,
+                                      input_speed_type=input_speed_type),
+                promotes_inputs=["dh_dr", "d2h_dr2", *inputs_list],
+                promotes_outputs=[Dynamic.Mission.FLIGHT_PATH_ANGLE, "dgam_dr",
+                                  *outputs_list],
+            )
         else:
-            outputs_list.append(('TAS', Dynamic.Mission.VELOCITY))
-
-        self.add_subsystem(
-            "fc",
-            UnsteadySolvedFlightConditions(num_nodes=nn,
-                                           ground_roll=ground_roll,
-                                           input_speed_type=input_speed_type),
-            promotes_inputs=inputs_list,
-            promotes_outputs=outputs_list,
-        )
+            self.add_subsystem("flight_path_angle",
+                               GammaComp(num_nodes=nn),
+                               promotes_inputs=["dh_dr", "d2h_dr2"],
+                               promotes_outputs=[Dynamic.Mission.FLIGHT_PATH_ANGLE,
+                                                 "dgam_dr"])
+
+            self.add_subsystem(
+                "fc",
+                UnsteadySolvedFlightConditions(num_nodes=nn,
+                                               ground_roll=ground_roll,
+                                               input_speed_type=input_speed_type),
+                promotes_inputs=inputs_list + self._flight_path_inputs(),
+                promotes_outputs=outputs_list,
+            )
 
+        warm_start_group = WarmStartGroup(warm_start_outputs=self._balance_outputs())
         control_iter_group = self.add_subsystem("control_iter_group",
-                                                subsys=om.Group(),
+                                                subsys=warm_start_group,
                                                 promotes_inputs=["*"],
                                                 promotes_outputs=["*"])
 
@@ -139,36 +373,27 @@ class UnsteadySolvedODE(BaseODE):
                                                     om.Group(),
                                                     promotes=["*"])
 
-        throttle_balance_comp = om.BalanceComp()
-        throttle_balance_comp.add_balance(Dynamic.Mission.THROTTLE,
-                                          units="unitless",
-                                          val=np.ones(nn) * 0.5,
-                                          lhs_name=Dynamic.Mission.THRUST_TOTAL,
-                                          rhs_name="thrust_req",
-                                          eq_units="lbf",
-                                          normalize=False,
-                                          lower=0.0 if throttle_enforcement == 'bounded' else None,
-                                          upper=1.0 if throttle_enforcement == 'bounded' else None,
-                                          res_ref=1.0e6,
-                                          )
+        throttle_balance_comp = ThrottleBalance(
+            num_nodes=nn,
+            thrust_ref=_typical_thrust(aviary_options),
+            bounded=throttle_enforcement == 'bounded')
 
         throttle_balance_group.add_subsystem("throttle_balance_comp", subsys=throttle_balance_comp,
                                              promotes_inputs=["*"],
                                              promotes_outputs=["*"])
 
-        throttle_balance_group.nonlinear_solver = om.NewtonSolver(solve_subsystems=True,
-                                                                  atol=1.0e-10,
-                                                                  rtol=1.0e-10,
-                                                                  )
+        throttle_balance_group.nonlinear_solver = om.NewtonSolver(
+            solve_subsystems=True,
+            atol=self.options['newton_atol'],
+            rtol=self.options['newton_rtol'],
+            maxiter=self.options['newton_maxiter'])
         throttle_balance_group.nonlinear_solver.linesearch = om.BoundsEnforceLS()
         throttle_balance_group.linear_solver = om.DirectSolver(assemble_jac=True)
         throttle_balance_group.nonlinear_solver.options['err_on_non_converge'] = True
 
-        kwargs = {
-            'num_nodes': nn,
-            'aviary_inputs': aviary_options,
-            'method': 'low_speed',
-        }
+        kwargs = {**self._BASE_KWARGS_TEMPLATE,
+                  'num_nodes': nn,
+                  'aviary_inputs': aviary_options}
         if self.options['clean']:
             kwargs['method'] = 'cruise'
         for subsystem in core_subsystems:
@@ -177,29 +402,32 @@ class UnsteadySolvedODE(BaseODE):
                 kwargs.update(subsystem_options[subsystem.name])
             system = subsystem.build_mission(**kwargs)
             if system is not None:
+                mission_inputs = subsystem.mission_inputs(**kwargs)
+                mission_outputs = subsystem.mission_outputs(**kwargs)
                 if isinstance(subsystem, AerodynamicsBuilderBase):
-                    mission_inputs = subsystem.mission_inputs(**kwargs)
                     if subsystem.code_origin is LegacyCode.FLOPS and 'angle_of_attack' in mission_inputs:
                         mission_inputs.remove('angle_of_attack')
                         mission_inputs.append(('angle_of_attack', 'alpha'))
                     control_iter_group.add_subsystem(subsystem.name,
                                                      system,
                                                      promotes_inputs=mission_inputs,
-                                                     promotes_outputs=subsystem.mission_outputs(**kwargs))
+                                                     promotes_outputs=mission_outputs)
                 elif isinstance(subsystem, PropulsionBuilderBase):
-                    throttle_balance_group.add_subsystem(subsystem.name,
-                                                         system,
-                                                         promotes_inputs=subsystem.mission_inputs(
-                                                             **kwargs),
-                                                         promotes_outputs=subsystem.mission_outputs(**kwargs))
+                    throttle_balance_group.add_subsystem(
+                        subsystem.name,
+                        system,
+                        promotes_inputs=mission_inputs,
+                        promotes_outputs=mission_outputs)
                 else:
                     self.add_subsystem(subsystem.name,
                                        system,
-                                       promotes_inputs=subsystem.mission_inputs(
-                                           **kwargs),
-                                       promotes_outputs=subsystem.mission_outputs(**kwargs))
+                                       promotes_inputs=mission_inputs,
+                                       promotes_outputs=mission_outputs)
 
-        eom_comp = UnsteadySolvedEOM(num_nodes=nn, ground_roll=ground_roll)
+        if self.options['jit_eom'] and numba is not None:
+            eom_comp = UnsteadySolvedEOMJIT(num_nodes=nn, ground_roll=ground_roll)
+        else:
+            eom_comp = UnsteadySolvedEOM(num_nodes=nn, ground_roll=ground_roll)
 
         input_list = ['*', (Dynamic.Mission.THRUST_TOTAL, "thrust_req"),
                       ('TAS', Dynamic.Mission.VELOCITY)]
@@ -207,45 +435,35 @@ class UnsteadySolvedODE(BaseODE):
                                          promotes_inputs=input_list,
                                          promotes_outputs=["*"])
 
-        thrust_alpha_bal = om.BalanceComp()
-        if not self.options['ground_roll']:
-            thrust_alpha_bal.add_balance("alpha",
-                                         units="rad",
-                                         val=np.zeros(nn),
-                                         lhs_name="dgam_dt_approx",
-                                         rhs_name="dgam_dt",
-                                         eq_units="rad/s",
-                                         lower=-np.pi/12,
-                                         upper=np.pi/12,
-                                         normalize=False)
-
-        thrust_alpha_bal.add_balance("thrust_req",
-                                     units="N",
-                                     val=100*np.ones(nn),
-                                     lhs_name="dTAS_dt_approx",
-                                     rhs_name="dTAS_dt",
-                                     eq_units="m/s**2",
-                                     normalize=False)
-
+        thrust_alpha_bal = ThrustAlphaBalance(num_nodes=nn,
+                                              ground_roll=ground_roll,
+                                              dgam_dt_ref=1.0e-3,
+                                              dTAS_dt_ref=1.0)
         control_iter_group.add_subsystem("thrust_alpha_bal", subsys=thrust_alpha_bal,
                                          promotes_inputs=["*"],
                                          promotes_outputs=["*"])
 
-        control_iter_group.nonlinear_solver = om.NewtonSolver(solve_subsystems=True,
-                                                              atol=1.0e-10,
-                                                              rtol=1.0e-10)
-        # control_iter_group.nonlinear_solver.linesearch = om.BoundsEnforceLS()
+        control_iter_group.nonlinear_solver = ModifiedNewtonSolver(
+            solve_subsystems=True,
+            atol=self.options['newton_atol'],
+            rtol=self.options['newton_rtol'],
+            maxiter=self.options['newton_maxiter'],
+            refresh_interval=self.options['modified_newton_refresh'])
+        # without backtracking, the Newton solver keeps its default BoundsEnforceLS,
+        # which takes the full step and only enforces the bounds on alpha
+        if self.options['ls_maxiter'] > 0:
+            control_iter_group.nonlinear_solver.linesearch = SubsolveArmijoGoldsteinLS(
+                bound_enforcement='vector',
+                maxiter=self.options['ls_maxiter'],
+                rho=self.options['ls_rho'],
+                c=1.0e-4,
+                retry_on_analysis_error=True,
+            )
+
         control_iter_group.linear_solver = om.DirectSolver(assemble_jac=True)
 
         self.add_subsystem("mass_rate",
-                           om.ExecComp("dmass_dr = fuelflow * dt_dr",
-                                       fuelflow={"units": "lbm/s", "shape": nn},
-                                       dt_dr={"units": "s/distance_units", "shape": nn},
-                                       dmass_dr={"units": "lbm/distance_units",
-                                                 "shape": nn,
-                                                 "tags": ['dymos.state_rate_source:mass',
-                                                          'dymos.state_units:lbm']},
-                                       has_diag_partials=True),
+                           MassRateComp(num_nodes=nn),
                            promotes_inputs=[
                                ("fuelflow", Dynamic.Mission.FUEL_FLOW_RATE_NEGATIVE_TOTAL), "dt_dr"],
                            promotes_outputs=["dmass_dr"])
@@ -253,22 +471,23 @@ class UnsteadySolvedODE(BaseODE):
         if self.options["include_param_comp"]:
             ParamPort.set_default_vals(self)
 
-        onn = np.ones(nn)
         self.set_input_defaults(name=Dynamic.Mission.DENSITY,
-                                val=rho_sl * onn, units="slug/ft**3")
+                                val=rho_sl, units="slug/ft**3", src_shape=nn)
         self.set_input_defaults(
             name=Dynamic.Mission.SPEED_OF_SOUND,
-            val=1116.4 * onn,
-            units="ft/s")
-        if not self.options['ground_roll']:
-            self.set_input_defaults(
-                name=Dynamic.Mission.FLIGHT_PATH_ANGLE, val=0.0 * onn, units="rad")
+            val=1116.4,
+            units="ft/s",
+            src_shape=nn)
+        for name in self._flight_path_inputs():
+            self.set_input_defaults(name=name, val=0.0, units="rad", src_shape=nn)
         self.set_input_defaults(name=Dynamic.Mission.VELOCITY,
-                                val=250. * onn, units="kn")
+                                val=250., units="kn", src_shape=nn)
         self.set_input_defaults(
             name=Dynamic.Mission.ALTITUDE,
-            val=10000. * onn,
-            units="ft")
-        self.set_input_defaults(name="dh_dr", val=0. * onn, units="ft/distance_units")
-        self.set_input_defaults(name="d2h_dr2", val=0. * onn,
-                                units="ft/distance_units**2")
+            val=10000.,
+            units="ft",
+            src_shape=nn)
+        self.set_input_defaults(name="dh_dr", val=0., units="ft/distance_units",
+                                src_shape=nn)
+        self.set_input_defaults(name="d2h_dr2", val=0.,
+                                units="ft/distance_units**2", src_shape=nn)
@@ -0,0 +1,192 @@
+import numpy as np
+import openmdao.api as om
+from openmdao.core.analysis_error import AnalysisError
+from openmdao.recorders.recording_iteration_stack import Recording
+from openmdao.utils.om_warnings import issue_warning, SolverWarning
+
+
+class SubsolveArmijoGoldsteinLS(om.ArmijoGoldsteinLS):
+    """
+    Armijo-Goldstein line search that runs the Newton sub-solve at every trial point.
+
+    When the Newton solver solves its subsystems, ArmijoGoldsteinLS evaluates the
+    backtracked steps after a sub-solve but the full step without one. The outputs of
+    the explicit components then keep the linearization error of the full step, which
+    is usually enough to reject it. Here the full step is evaluated the same way as the
+    backtracked ones, so it is accepted wherever the Newton model holds.
+    """
+
+    SOLVER = 'LS: AG subsolve'
+
+    def _run_trial(self):
+        """
+        Run the sub-solve, if requested, and compute the residuals at the trial point.
+        """
+        if self._do_subsolve:
+            self._solver_info.append_solver()
+            try:
+                self._gs_iter()
+            finally:
+                self._solver_info.pop()
+
+        self._run_apply()
+
+    def _iter_initialize(self):
+        """
+        Perform any necessary pre-processing operations.
+
+        Returns
+        -------
+        float
+            Line search objective at the full step.
+        """
+        system = self._system()
+        self.alpha = alpha = self.options['alpha']
+
+        u = system._outputs
+        du = system._doutputs
+
+        self._run_apply()
+        phi0 = self._line_search_objective()
+        if phi0 == 0.0:
+            phi0 = 1.0
+        self._phi0 = phi0
+        # a full Newton step drives the linearized residuals to zero
+        self._dir_derivative = -phi0
+
+        u.add_scal_vec(alpha, du)
+        self._enforce_bounds(step=du, alpha=alpha)
+
+        cache = self._solver_info.save_cache()
+        try:
+            self._run_trial()
+            phi = self._line_search_objective()
+        except AnalysisError:
+            self._solver_info.restore_cache(cache)
+
+            if not self.options['retry_on_analysis_error']:
+                raise
+
+            self._analysis_error_raised = True
+            phi = np.nan
+
+        return phi
+
+    def _single_iteration(self):
+        """
+        Perform the operations in the iteration loop.
+        """
+        # the first pass of the loop is at the full step, already evaluated by
+        # _iter_initialize
+        if self._iter_count == 0:
+            return
+
+        self._analysis_error_raised = False
+        self._run_trial()
+
+
+class ModifiedNewtonSolver(om.NewtonSolver):
+    """
+    Newton solver that reuses the Jacobian and its factorization across iterations.
+
+    The system is only relinearized on the first iteration of each solve and then every
+    `refresh_interval` iterations. In between, the Newton step is computed from the
+    stale linearization, which skips the partials evaluation and the factorization of
+    the linear solver. Setting `refresh_interval` to 1 recovers the standard Newton
+    method.
+
+    With a SubsolveArmijoGoldsteinLS line search, the subsystems are solved by the line
+    search at the accepted step rather than once more after it.
+
+    A solve that fails without raising, because err_on_non_converge is False, issues a
+    SolverWarning so that the unconverged outputs do not go unnoticed. Whether the last
+    solve met the atol/rtol criteria is available as the `converged` attribute.
+    """
+
+    SOLVER = 'NL: Modified Newton'
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+        self.converged = False
+
+    def _declare_options(self):
+        super()._declare_options()
+
+        self.options.declare('refresh_interval', types=int, default=3, lower=1,
+                             desc='Number of Newton iterations between updates of the '
+                             'Jacobian and its factorization.')
+
+    def report_failure(self, msg):
+        """
+        Report a failure that has occurred, warning if it does not raise an error.
+
+        Parameters
+        ----------
+        msg : str
+            Message indicating the failure.
+        """
+        self.converged = False
+
+        super().report_failure(msg)
+
+        # under complex step only a single iteration is taken, which is not a failure
+        if not self._system().under_complex_step:
+            issue_warning(msg, category=SolverWarning)
+
+    def _solve(self):
+        """
+        Run the iterative solver, recording whether it converged.
+        """
+        # report_failure clears the flag if the solve fails
+        self.converged = True
+        super()._solve()
+
+    def _single_iteration(self):
+        """
+        Perform the operations in the iteration loop.
+        """
+        system = self._system()
+        self._solver_info.append_subsolver()
+        do_subsolve = self.options['solve_subsystems'] and \
+            not system.under_complex_step and \
+            (self._iter_count < self.options['max_sub_solves'])
+        do_sub_ln = self.linear_solver._linearize_children()
+        refresh = self._iter_count % self.options['refresh_interval'] == 0
+
+        # Disable local fd
+        approx_status = system._owns_approx_jac
+        system._owns_approx_jac = False
+
+        try:
+            system._dresiduals.set_vec(system._residuals)
+            system._dresiduals *= -1.0
+
+            if refresh:
+                system._linearize(sub_do_ln=do_sub_ln)
+                self._linearize()
+
+            self.linear_solver.solve('fwd')
+
+            if self.linesearch and not system.under_complex_step:
+                self.linesearch._do_subsolve = do_subsolve
+                self.linesearch.solve()
+
+                # the subsystems are already solved at the accepted step
+                if isinstance(self.linesearch, SubsolveArmijoGoldsteinLS) and \
+                        not self.linesearch._analysis_error_raised:
+                    do_subsolve = False
+            else:
+                system._outputs += system._doutputs
+
+            self._solver_info.pop()
+
+            # Hybrid newton support.
+            if do_subsolve:
+                with Recording('Newton_subsolve', 0, self):
+                    self._solver_info.append_solver()
+                    self._gs_iter()
+                    self._solver_info.pop()
+        finally:
+            # Enable local fd
+            system._owns_approx_jac = approx_status